@@ -8,6 +8,7 @@ from mlx_lm import generate, load
 from pydantic import BaseModel
 
 from nebulus_core.intelligence.core.audit import AuditEvent, AuditEventType, AuditLogger
+from shared.audit.storage import enable_wal, ensure_indexes
 from shared.config.audit_config import AuditConfig
 from shared.middleware.audit_middleware import AuditMiddleware
 
@@ -174,6 +175,8 @@ def startup_event():
     audit_path.mkdir(parents=True, exist_ok=True)
     audit_db_path = audit_path / "audit.db"
     audit_logger = AuditLogger(db_path=audit_db_path)
+    enable_wal(audit_db_path)
+    ensure_indexes(audit_db_path)
 
     print(f"Audit logging: {'enabled' if audit_config.enabled else 'disabled'}")
     print(f"Audit retention: {audit_config.retention_days} days")
@@ -3,21 +3,30 @@
 Handles CSV upload, table management, and schema operations.
 """
 
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from intelligence.api.dependencies import (
+    get_pii_detector,
+    invalidate_known_collections,
+    load_cached_template,
+    require_valid_table_name,
+)
 from nebulus_core.intelligence.core.audit import AuditEvent, AuditEventType
 from nebulus_core.intelligence.core.ingest import DataIngestor
-from nebulus_core.intelligence.core.pii import PIIDetector
 from nebulus_core.intelligence.core.vector_engine import VectorEngine
-from nebulus_core.intelligence.templates import load_template
 
 router = APIRouter(prefix="/data", tags=["data"])
 
+# Matches exactly the characters for which str.isalnum() is False
+_NON_ALNUM = re.compile(r"[\W_]")
+
 
 class TableInfo(BaseModel):
     """Information about a data table."""
@@ -61,26 +70,23 @@ class SchemaInfo(BaseModel):
 
 def _get_ingestor(request: Request) -> DataIngestor:
     """Get or create a DataIngestor instance with vector support."""
-    db_path = request.app.state.db_path / "main.db"
+    db_path = request.app.state.main_db_path
     template_name = request.app.state.template
     vector_client = request.app.state.vector_client
 
     # Create vector engine for semantic search
     vector_engine = VectorEngine(vector_client)
 
-    # Create PII detector
-    pii_detector = PIIDetector()
+    # Shared PII detector (patterns compiled once per process)
+    pii_detector = get_pii_detector(request)
 
-    # Load template
-    try:
-        template = load_template(template_name)
-    except Exception:
-        template = None
+    # Template is parsed once per process (None if it cannot be loaded)
+    template = load_cached_template(template_name)
 
     return DataIngestor(db_path, pii_detector, vector_engine, template)
 
 
-def _audit_log_data_operation(
+async def _audit_log_data_operation(
     request: Request,
     event_type: AuditEventType,
     table_name: str,
@@ -89,7 +95,11 @@ def _audit_log_data_operation(
     success: bool,
     error: Optional[str] = None,
 ):
-    """Helper to log data operations to audit log."""
+    """Helper to log data operations to audit log.
+
+    The SQLite write runs in the threadpool so it does not block the event
+    loop that serves these async routes.
+    """
     if not hasattr(request.app.state, "audit_logger"):
         return
     if not request.app.state.audit_config.enabled:
@@ -124,7 +134,7 @@ def _audit_log_data_operation(
         success=success,
         error_message=error,
     )
-    audit_logger.log(event)
+    await run_in_threadpool(audit_logger.log, event)
 
 
 @router.post("/upload", response_model=IngestResult)
@@ -145,10 +155,13 @@ async def upload_csv(
 
     # Use filename as table name if not provided
     if not table_name:
-        table_name = Path(file.filename).stem.lower().replace(" ", "_")
+        table_name = Path(file.filename).stem.lower()
         # Clean table name
-        table_name = "".join(c if c.isalnum() else "_" for c in table_name)
-        table_name = table_name.strip("_")
+        table_name = _NON_ALNUM.sub("_", table_name).strip("_")
+
+    # Reject names the table routes would refuse, so every created table
+    # can still be viewed and deleted
+    require_valid_table_name(table_name)
 
     # Read file content
     content = await file.read()
@@ -156,12 +169,16 @@ async def upload_csv(
     # Ingest the CSV
     ingestor = _get_ingestor(request)
 
+    # Parsing and loading run in the threadpool to keep the event loop free
     try:
-        result = ingestor.ingest_csv(content, table_name)
+        result = await run_in_threadpool(ingestor.ingest_csv, content, table_name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {e}")
+    finally:
+        # Embeddings may have been (re)created even if ingestion failed
+        invalidate_known_collections(request)
 
     # Build PII summary if detection was performed
     pii_summary = None
@@ -174,7 +191,7 @@ async def upload_csv(
         )
 
     # Log data upload to audit
-    _audit_log_data_operation(
+    await _audit_log_data_operation(
         request=request,
         event_type=AuditEventType.DATA_UPLOAD,
         table_name=result.table_name,
@@ -190,7 +207,7 @@ async def upload_csv(
 
     # Log PII detection if found
     if result.pii_detected and pii_summary:
-        _audit_log_data_operation(
+        await _audit_log_data_operation(
             request=request,
             event_type=AuditEventType.PII_DETECTED,
             table_name=result.table_name,
@@ -216,8 +233,12 @@ async def upload_csv(
 
 
 @router.get("/tables", response_model=list[TableInfo])
-async def list_tables(request: Request) -> list[TableInfo]:
-    """List all uploaded data tables with schema info."""
+def list_tables(request: Request) -> list[TableInfo]:
+    """List all uploaded data tables with schema info.
+
+    Declared sync so FastAPI runs it in the threadpool: building the list
+    issues a COUNT(*) per table.
+    """
     ingestor = _get_ingestor(request)
     tables = []
 
@@ -240,8 +261,9 @@ async def list_tables(request: Request) -> list[TableInfo]:
 
 
 @router.get("/tables/{table_name}/schema", response_model=SchemaInfo)
-async def get_schema(request: Request, table_name: str) -> SchemaInfo:
+def get_schema(request: Request, table_name: str) -> SchemaInfo:
     """Get detailed schema for a table."""
+    require_valid_table_name(table_name)
     ingestor = _get_ingestor(request)
 
     if table_name not in ingestor.list_tables():
@@ -258,12 +280,13 @@ async def get_schema(request: Request, table_name: str) -> SchemaInfo:
 
 
 @router.get("/tables/{table_name}/preview")
-async def preview_data(
+def preview_data(
     request: Request,
     table_name: str,
     limit: int = 10,
 ) -> list[dict]:
     """Preview rows from a table."""
+    require_valid_table_name(table_name)
     ingestor = _get_ingestor(request)
 
     if table_name not in ingestor.list_tables():
@@ -275,10 +298,26 @@ async def preview_data(
 @router.delete("/tables/{table_name}")
 async def delete_table(request: Request, table_name: str) -> dict:
     """Delete a table and its associated data."""
+    try:
+        require_valid_table_name(table_name)
+    except HTTPException as e:
+        await _audit_log_data_operation(
+            request=request,
+            event_type=AuditEventType.DATA_DELETE,
+            table_name=table_name,
+            action="delete_table",
+            details={},
+            success=False,
+            error=f"Invalid table name: {e.detail}",
+        )
+        raise
+
     ingestor = _get_ingestor(request)
+    deleted = await run_in_threadpool(ingestor.delete_table, table_name)
+    invalidate_known_collections(request)
 
-    if not ingestor.delete_table(table_name):
-        _audit_log_data_operation(
+    if not deleted:
+        await _audit_log_data_operation(
             request=request,
             event_type=AuditEventType.DATA_DELETE,
             table_name=table_name,
@@ -290,7 +329,7 @@ async def delete_table(request: Request, table_name: str) -> dict:
         raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
 
     # Log successful deletion
-    _audit_log_data_operation(
+    await _audit_log_data_operation(
         request=request,
         event_type=AuditEventType.DATA_DELETE,
         table_name=table_name,
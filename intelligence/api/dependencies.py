@@ -0,0 +1,209 @@
+"""Shared dependency helpers for the intelligence API routers.
+
+Template configs and the KnowledgeManager, FeedbackManager, PIIDetector and
+VectorEngine instances are cached across requests, so routes do not
+re-parse the template and knowledge files on every call. Objects that may
+hold per-thread state (``SQLEngine`` and the orchestrator built around it)
+are built per request by ``build_*`` helpers, called from the thread that
+runs the query.
+"""
+
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request
+
+from nebulus_core.intelligence.core.classifier import QuestionClassifier
+from nebulus_core.intelligence.core.feedback import FeedbackManager
+from nebulus_core.intelligence.core.knowledge import KnowledgeManager
+from nebulus_core.intelligence.core.orchestrator import IntelligenceOrchestrator
+from nebulus_core.intelligence.core.pii import PIIDetector
+from nebulus_core.intelligence.core.security import ValidationError, validate_table_name
+from nebulus_core.intelligence.core.sql_engine import SQLEngine
+from nebulus_core.intelligence.core.vector_engine import VectorEngine
+from nebulus_core.intelligence.templates import load_template
+
+# Seconds cached vector collection names are trusted before re-listing
+KNOWN_COLLECTIONS_TTL = 10.0
+
+
+@lru_cache(maxsize=32)
+def _load_template_once(template_name: str) -> Any:
+    """Load a vertical template, caching only successful loads."""
+    return load_template(template_name)
+
+
+def load_cached_template(template_name: str) -> Optional[Any]:
+    """Load a vertical template once per template name.
+
+    Failures are not cached, so a transient error is retried on the next
+    request instead of disabling the template for the process lifetime.
+
+    Returns:
+        The template, or None if the template cannot be loaded.
+    """
+    try:
+        return _load_template_once(template_name)
+    except Exception:
+        return None
+
+
+def load_template_config(template_name: str) -> Optional[Any]:
+    """Get a vertical template's config from the cached template.
+
+    Returns:
+        The template config, or None if the template cannot be loaded.
+    """
+    template = load_cached_template(template_name)
+    return template.config if template is not None else None
+
+
+@lru_cache(maxsize=16)
+def _build_knowledge_manager(
+    knowledge_path: Path,
+    template_name: str,
+    mtime_ns: int,
+) -> KnowledgeManager:
+    """Build a KnowledgeManager for one version of the knowledge file.
+
+    ``mtime_ns`` is only part of the cache key, so a changed file on disk
+    produces a fresh manager instead of a stale cached one.
+    """
+    return KnowledgeManager(knowledge_path, load_template_config(template_name))
+
+
+def get_knowledge_manager(request: Request) -> KnowledgeManager:
+    """Get a cached KnowledgeManager, rebuilt when knowledge.json changes."""
+    knowledge_path = request.app.state.knowledge_json_path
+
+    try:
+        mtime_ns = knowledge_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+
+    return _build_knowledge_manager(
+        knowledge_path, request.app.state.template, mtime_ns
+    )
+
+
+def build_sql_engine(request: Request) -> SQLEngine:
+    """Build a SQLEngine for the current request.
+
+    SQLEngine may hold a sqlite3 connection, which cannot be used from
+    another thread, so it is not shared and is not resolved via ``Depends``
+    (that would create it on a different thread than the route body).
+    """
+    state = request.app.state
+    return SQLEngine(state.main_db_path, state.llm, state.model)
+
+
+def _shared_vector_engine(state: Any) -> VectorEngine:
+    """Get the VectorEngine stored on app.state, creating it on first use."""
+    vector_engine = getattr(state, "vector_engine", None)
+    if vector_engine is None:
+        vector_engine = VectorEngine(state.vector_client)
+        state.vector_engine = vector_engine
+    return vector_engine
+
+
+async def get_vector_engine(request: Request) -> VectorEngine:
+    """Get the shared VectorEngine.
+
+    VectorEngine only wraps the VectorClient on app.state, which the service
+    already shares across requests, so one instance is shared as well.
+    """
+    return _shared_vector_engine(request.app.state)
+
+
+def require_valid_table_name(table_name: str) -> str:
+    """Validate a client-supplied table name before it reaches SQL.
+
+    Raises:
+        HTTPException: 400 if the name is not a safe SQL identifier.
+    """
+    try:
+        return validate_table_name(table_name)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def get_feedback_manager(request: Request) -> FeedbackManager:
+    """Get the shared FeedbackManager, created on first use.
+
+    FeedbackManager opens a connection per call, so one instance is safe to
+    share across threadpool workers and the feedback database is only
+    initialized once per process.
+    """
+    state = request.app.state
+    feedback_manager = getattr(state, "feedback_manager", None)
+    if feedback_manager is None:
+        feedback_manager = FeedbackManager(state.feedback_path / "feedback.db")
+        state.feedback_manager = feedback_manager
+    return feedback_manager
+
+
+def get_pii_detector(request: Request) -> PIIDetector:
+    """Get the shared PIIDetector, created on first use.
+
+    The detector only holds its compiled patterns, so one instance can scan
+    every upload and the patterns are compiled once per process.
+    """
+    state = request.app.state
+    pii_detector = getattr(state, "pii_detector", None)
+    if pii_detector is None:
+        pii_detector = PIIDetector()
+        state.pii_detector = pii_detector
+    return pii_detector
+
+
+def collection_exists(
+    request: Request,
+    vector_engine: VectorEngine,
+    table_name: str,
+) -> bool:
+    """Check whether embeddings exist for a table.
+
+    Collection names are cached on app.state for ``KNOWN_COLLECTIONS_TTL``
+    seconds. A miss refreshes the cache at once, so collections created by
+    another worker are still found. The TTL bounds how long a collection
+    deleted by another worker is still reported as present.
+    """
+    state = request.app.state
+    now = time.monotonic()
+    cached = getattr(state, "known_collections", None)
+    if (
+        cached is not None
+        and now - cached[0] < KNOWN_COLLECTIONS_TTL
+        and table_name in cached[1]
+    ):
+        return True
+
+    known = set(vector_engine.list_collections())
+    state.known_collections = (now, known)
+    return table_name in known
+
+
+def invalidate_known_collections(request: Request) -> None:
+    """Drop the cached collection names after tables are added or removed."""
+    request.app.state.known_collections = None
+
+
+def build_orchestrator(request: Request) -> IntelligenceOrchestrator:
+    """Build an IntelligenceOrchestrator for the current request.
+
+    The classifier and SQLEngine are built per request (see
+    ``build_sql_engine``). The LLM client, VectorEngine and cached
+    KnowledgeManager are shared. Call this from the thread that runs the
+    question, not from an async provider: loading knowledge does file I/O.
+    """
+    state = request.app.state
+    return IntelligenceOrchestrator(
+        classifier=QuestionClassifier(state.llm, state.model),
+        sql_engine=build_sql_engine(request),
+        vector_engine=_shared_vector_engine(state),
+        knowledge=get_knowledge_manager(request),
+        llm=state.llm,
+        model=state.model,
+    )
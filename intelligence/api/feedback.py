@@ -8,11 +8,8 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
-from nebulus_core.intelligence.core.feedback import (
-    FeedbackManager,
-    FeedbackRating,
-    FeedbackType,
-)
+from intelligence.api.dependencies import get_feedback_manager
+from nebulus_core.intelligence.core.feedback import FeedbackRating, FeedbackType
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
@@ -78,12 +75,6 @@ class RefinementSuggestions(BaseModel):
     suggestions: List[str]
 
 
-def _get_feedback_manager(request: Request) -> FeedbackManager:
-    """Get or create a FeedbackManager instance."""
-    feedback_path = request.app.state.feedback_path / "feedback.db"
-    return FeedbackManager(feedback_path)
-
-
 @router.post("/submit", response_model=FeedbackResponse)
 def submit_feedback(
     request: Request,
@@ -97,7 +88,7 @@ def submit_feedback(
     - Include context to help identify patterns
     - Optional comment for detailed feedback
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
 
     try:
         feedback_type = FeedbackType(body.feedback_type)
@@ -142,7 +133,7 @@ def record_outcome(
     This helps track whether recommendations led to good results,
     enabling the system to learn from real-world outcomes.
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
 
     success = manager.record_outcome(body.feedback_id, body.outcome)
 
@@ -175,7 +166,7 @@ def get_feedback_summary(
     - Breakdown by feedback type
     - Recent comments
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
 
     fb_type = None
     if feedback_type:
@@ -217,7 +208,7 @@ def get_negative_patterns(
     Identifies queries or contexts that received negative feedback,
     helping to pinpoint areas for improvement.
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
 
     fb_type = None
     if feedback_type:
@@ -247,7 +238,7 @@ def get_refinement_suggestions(
     - Business rule modifications
     - Areas needing attention
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
     analysis = manager.get_feedback_for_refinement()
 
     return RefinementSuggestions(
@@ -275,7 +266,7 @@ def get_feedback_history(
 
     Allows reviewing past feedback for analysis.
     """
-    manager = _get_feedback_manager(request)
+    manager = get_feedback_manager(request)
 
     fb_type = None
     if feedback_type:
@@ -3,17 +3,33 @@
 Provides automated insight generation and retrieval.
 """
 
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
-from nebulus_core.intelligence.core.insights import InsightGenerator
-from nebulus_core.intelligence.core.knowledge import KnowledgeManager
-from nebulus_core.intelligence.templates import load_template
+from intelligence.api.dependencies import get_knowledge_manager, load_template_config
+from nebulus_core.intelligence.core.insights import (
+    InsightGenerator,
+    InsightPriority,
+    InsightReport,
+)
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
+# Seconds a generated report is reused while the database is unchanged
+REPORT_CACHE_TTL = 300.0
+_REPORT_CACHE_SIZE = 16
+# Guards the report cache and in-flight table on app.state (never held while
+# a report is being generated)
+_REPORT_LOCK = threading.Lock()
+_HIGH_PRIORITIES = (InsightPriority.HIGH, InsightPriority.CRITICAL)
+
 
 class InsightResponse(BaseModel):
     """A single insight."""
@@ -41,20 +57,106 @@ class InsightReportResponse(BaseModel):
     by_type: Dict[str, int]
 
 
-def _get_insight_generator(request: Request) -> InsightGenerator:
-    """Get an InsightGenerator instance."""
-    db_path = request.app.state.db_path / "main.db"
-    knowledge_path = request.app.state.knowledge_path / "knowledge.json"
-    template_name = request.app.state.template
-
-    # Load knowledge manager
+def _get_knowledge(request: Request) -> Optional[Any]:
+    """Get the KnowledgeManager, or None when the template is unavailable."""
+    if load_template_config(request.app.state.template) is None:
+        return None
     try:
-        template = load_template(template_name)
-        km = KnowledgeManager(knowledge_path, template.config)
+        return get_knowledge_manager(request)
     except Exception:
-        km = None
+        return None
+
+
+def _db_signature(db_path: Path) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """Identify the current contents of the database and its WAL file."""
+    signature = []
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _parse_tables(tables: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated table list from the query string."""
+    if not tables:
+        return None
+    return [t.strip() for t in tables.split(",")]
 
-    return InsightGenerator(db_path, km)
+
+def _get_report(request: Request, tables: Optional[str] = None) -> InsightReport:
+    """Generate an insight report, reusing a recent one if nothing changed.
+
+    Reports are keyed on the requested tables and the mtime and size of the
+    database (and its WAL), and are tied to the KnowledgeManager they were
+    built with. Entries expire after ``REPORT_CACHE_TTL`` seconds so that
+    date-relative insights are still refreshed.
+
+    The shared lock only covers cache lookups and updates. Generation runs
+    outside it; concurrent requests for the same report wait on the first
+    request's future instead of running their own analysis, while requests
+    for other reports proceed independently.
+    """
+    state = request.app.state
+    table_list = _parse_tables(tables)
+    knowledge = _get_knowledge(request)
+    key = (
+        tuple(table_list) if table_list else None,
+        _db_signature(Path(state.main_db_path)),
+    )
+
+    with _REPORT_LOCK:
+        cache = getattr(state, "insight_reports", None)
+        if cache is None:
+            cache = {}
+            state.insight_reports = cache
+        pending = getattr(state, "insight_reports_pending", None)
+        if pending is None:
+            pending = {}
+            state.insight_reports_pending = pending
+
+        cached = cache.get(key)
+        if (
+            cached is not None
+            and cached[0] is knowledge
+            and time.monotonic() - cached[1] < REPORT_CACHE_TTL
+        ):
+            return cached[2]
+
+        pending_key = (key, id(knowledge))
+        future = pending.get(pending_key)
+        if future is not None:
+            owner = False
+        else:
+            owner = True
+            future = Future()
+            pending[pending_key] = future
+
+    if not owner:
+        return future.result()
+
+    try:
+        report = InsightGenerator(state.main_db_path, knowledge).generate_insights(
+            table_list
+        )
+    except BaseException as e:
+        with _REPORT_LOCK:
+            pending.pop(pending_key, None)
+        future.set_exception(e)
+        raise
+
+    with _REPORT_LOCK:
+        pending.pop(pending_key, None)
+        cache.pop(key, None)
+        if len(cache) >= _REPORT_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = (knowledge, time.monotonic(), report)
+
+    future.set_result(report)
+    return report
 
 
 @router.get("/generate", response_model=InsightReportResponse)
@@ -74,13 +176,7 @@ def generate_insights(
     Args:
         tables: Comma-separated list of table names (optional)
     """
-    generator = _get_insight_generator(request)
-
-    table_list = None
-    if tables:
-        table_list = [t.strip() for t in tables.split(",")]
-
-    report = generator.generate_insights(table_list)
+    report = _get_report(request, tables)
     data = report.to_dict()
 
     return InsightReportResponse(
@@ -117,13 +213,8 @@ def get_high_priority_insights(
 
     Use this for a quick overview of items requiring immediate attention.
     """
-    generator = _get_insight_generator(request)
-
-    table_list = None
-    if tables:
-        table_list = [t.strip() for t in tables.split(",")]
-
-    insights = generator.get_high_priority_insights(table_list)
+    report = _get_report(request, tables)
+    insights = [i for i in report.insights if i.priority in _HIGH_PRIORITIES]
 
     return [
         InsightResponse(
@@ -156,13 +247,8 @@ def get_insights_by_category(
     - pricing
     - etc.
     """
-    generator = _get_insight_generator(request)
-
-    table_list = None
-    if tables:
-        table_list = [t.strip() for t in tables.split(",")]
-
-    insights = generator.get_insights_by_category(category, table_list)
+    report = _get_report(request, tables)
+    insights = [i for i in report.insights if i.category == category]
 
     return [
         InsightResponse(
@@ -187,13 +273,12 @@ def get_insight_summary(request: Request) -> dict:
 
     Returns counts by priority and type without full insight details.
     """
-    generator = _get_insight_generator(request)
-    report = generator.generate_insights()
+    report = _get_report(request)
 
     return {
         "summary": report.summary,
         "total_insights": len(report.insights),
-        "by_priority": report._count_by_priority(),
-        "by_type": report._count_by_type(),
+        "by_priority": dict(Counter(i.priority.value for i in report.insights)),
+        "by_type": dict(Counter(i.insight_type.value for i in report.insights)),
         "tables_analyzed": report.tables_analyzed,
     }
@@ -3,15 +3,14 @@
 Handles domain knowledge: scoring factors, business rules, metrics.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from nebulus_core.intelligence.core.feedback import FeedbackManager
+from intelligence.api.dependencies import get_feedback_manager, get_knowledge_manager
 from nebulus_core.intelligence.core.knowledge import KnowledgeManager
 from nebulus_core.intelligence.core.refinement import KnowledgeRefiner, WeightAdjustment
-from nebulus_core.intelligence.templates import load_template
 
 router = APIRouter(prefix="/knowledge", tags=["knowledge"])
 
@@ -68,26 +67,39 @@ class AddCustomKnowledgeRequest(BaseModel):
     value: Any
 
 
-def _get_knowledge_manager(request: Request) -> KnowledgeManager:
-    """Get or create a KnowledgeManager instance."""
-    knowledge_path = request.app.state.knowledge_path / "knowledge.json"
-    template_name = request.app.state.template
+def _cached_export(
+    request: Request,
+    name: str,
+    build: Callable[[KnowledgeManager], Any],
+) -> Any:
+    """Return a cached export of the current domain knowledge.
+
+    Entries are tied to the KnowledgeManager instance, which is replaced when
+    knowledge.json changes on disk, and are dropped by the routes that
+    modify knowledge in place.
+    """
+    km = get_knowledge_manager(request)
+    state = request.app.state
+    cache = getattr(state, "knowledge_exports", None)
+    if cache is None:
+        cache = state.knowledge_exports = {}
+
+    cached = cache.get(name)
+    if cached is None or cached[0] is not km:
+        cached = (km, build(km))
+        cache[name] = cached
+    return cached[1]
 
-    # Load template config
-    try:
-        template = load_template(template_name)
-        template_config = template.config
-    except Exception:
-        template_config = None
 
-    return KnowledgeManager(knowledge_path, template_config)
+def _invalidate_exports(request: Request) -> None:
+    """Drop cached knowledge exports after a modification."""
+    request.app.state.knowledge_exports = {}
 
 
 @router.get("/")
 def get_knowledge(request: Request) -> dict:
     """Get all domain knowledge."""
-    km = _get_knowledge_manager(request)
-    return km.to_dict()
+    return _cached_export(request, "dict", lambda km: km.to_dict())
 
 
 @router.get("/scoring")
@@ -96,7 +108,7 @@ def get_scoring_factors(
     category: str = "perfect_sale",
 ) -> List[dict]:
     """Get scoring factors for a category."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     factors = km.get_scoring_factors(category)
     return [
         {
@@ -112,7 +124,7 @@ def get_scoring_factors(
 @router.get("/scoring/all")
 def get_all_scoring_factors(request: Request) -> Dict[str, List[dict]]:
     """Get all scoring factors for all categories."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     all_factors = km.get_all_scoring_factors()
     return {
         category: [
@@ -136,7 +148,7 @@ def update_scoring_factor(
     body: UpdateScoringFactorRequest,
 ) -> dict:
     """Update a scoring factor's weight or description."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
 
     success = km.update_scoring_factor(
         category=category,
@@ -144,6 +156,7 @@ def update_scoring_factor(
         weight=body.weight,
         description=body.description,
     )
+    _invalidate_exports(request)
 
     if not success:
         raise HTTPException(
@@ -157,7 +170,7 @@ def update_scoring_factor(
 @router.get("/rules")
 def get_business_rules(request: Request) -> List[dict]:
     """Get all business rules."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     rules = km.get_business_rules()
     return [
         {
@@ -176,7 +189,7 @@ def add_business_rule(
     body: AddRuleRequest,
 ) -> dict:
     """Add a new business rule."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
 
     rule = km.add_business_rule(
         name=body.name,
@@ -184,6 +197,7 @@ def add_business_rule(
         condition=body.condition,
         severity=body.severity,
     )
+    _invalidate_exports(request)
 
     return {
         "status": "created",
@@ -199,7 +213,7 @@ def add_business_rule(
 @router.get("/metrics")
 def get_metrics(request: Request) -> Dict[str, dict]:
     """Get all metrics."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     metrics = km.get_metrics()
     return {
         name: {
@@ -216,7 +230,7 @@ def get_metrics(request: Request) -> Dict[str, dict]:
 @router.get("/metrics/{metric_name}")
 def get_metric(request: Request, metric_name: str) -> dict:
     """Get a specific metric."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     metric = km.get_metric(metric_name)
 
     if not metric:
@@ -241,15 +255,16 @@ def add_custom_knowledge(
     body: AddCustomKnowledgeRequest,
 ) -> dict:
     """Add custom knowledge."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     km.add_custom_knowledge(body.key, body.value)
+    _invalidate_exports(request)
     return {"status": "added", "key": body.key}
 
 
 @router.get("/custom/{key}")
 def get_custom_knowledge(request: Request, key: str) -> dict:
     """Get custom knowledge by key."""
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     value = km.get_custom_knowledge(key)
 
     if value is None:
@@ -264,16 +279,14 @@ def get_custom_knowledge(request: Request, key: str) -> dict:
 @router.get("/prompt")
 def get_knowledge_prompt(request: Request) -> dict:
     """Get domain knowledge formatted for LLM prompt injection."""
-    km = _get_knowledge_manager(request)
-    return {"prompt": km.export_for_prompt()}
+    prompt = _cached_export(request, "prompt", lambda km: km.export_for_prompt())
+    return {"prompt": prompt}
 
 
 def _get_refiner(request: Request) -> KnowledgeRefiner:
     """Get a KnowledgeRefiner instance."""
-    km = _get_knowledge_manager(request)
-    feedback_path = request.app.state.feedback_path / "feedback.db"
-    fm = FeedbackManager(feedback_path)
-    return KnowledgeRefiner(km, fm)
+    km = get_knowledge_manager(request)
+    return KnowledgeRefiner(km, get_feedback_manager(request))
 
 
 @router.get("/refinement/analyze")
@@ -352,6 +365,7 @@ def apply_refinement_adjustments(
         adjustments=adjustments,
         min_confidence=body.min_confidence,
     )
+    _invalidate_exports(request)
 
     return {
         "applied": sum(1 for v in results.values() if v),
@@ -3,24 +3,37 @@
 Handles natural language questions and SQL execution.
 """
 
+import asyncio
 import hashlib
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
-
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field
+
+from intelligence.api.dependencies import (
+    build_orchestrator,
+    build_sql_engine,
+    collection_exists,
+    get_knowledge_manager,
+    get_vector_engine,
+    require_valid_table_name,
+)
 from nebulus_core.intelligence.core.audit import AuditEvent, AuditEventType
-from nebulus_core.intelligence.core.classifier import QuestionClassifier
-from nebulus_core.intelligence.core.knowledge import KnowledgeManager
-from nebulus_core.intelligence.core.orchestrator import IntelligenceOrchestrator
 from nebulus_core.intelligence.core.scoring import SaleScorer
-from nebulus_core.intelligence.core.sql_engine import SQLEngine, UnsafeQueryError
+from nebulus_core.intelligence.core.sql_engine import UnsafeQueryError
 from nebulus_core.intelligence.core.vector_engine import VectorEngine
-from nebulus_core.intelligence.templates import load_template
 
 router = APIRouter(prefix="/query", tags=["query"])
 
+# Upper bound on the ``limit`` a /score request may ask for
+MAX_SCORE_LIMIT = 1000
+
+# Limits for /ask/batch: questions per request, and questions answered at once
+MAX_BATCH_QUESTIONS = 50
+BATCH_CONCURRENCY = 4
+
 
 class QuestionRequest(BaseModel):
     """Request to ask a natural language question."""
@@ -31,6 +44,8 @@ class QuestionRequest(BaseModel):
 class IntelligenceResponse(BaseModel):
     """Response from the intelligence engine."""
 
+    model_config = ConfigDict(frozen=True)
+
     answer: str
     supporting_data: Optional[list[dict]] = None
     reasoning: Optional[str] = None
@@ -40,6 +55,18 @@ class IntelligenceResponse(BaseModel):
     confidence: float = 0.0
 
 
+class BatchQuestionRequest(BaseModel):
+    """Request to ask several natural language questions."""
+
+    questions: list[str] = Field(min_length=1, max_length=MAX_BATCH_QUESTIONS)
+
+
+class BatchIntelligenceResponse(BaseModel):
+    """Answers to a batch of questions, in request order."""
+
+    results: list[IntelligenceResponse]
+
+
 class SQLRequest(BaseModel):
     """Request to execute raw SQL."""
 
@@ -49,58 +76,14 @@ class SQLRequest(BaseModel):
 class SQLResponse(BaseModel):
     """Response from SQL execution."""
 
+    model_config = ConfigDict(frozen=True)
+
     columns: list[str]
     rows: list[list[Any]]
     row_count: int
     sql: str
 
 
-def _get_sql_engine(request: Request) -> SQLEngine:
-    """Get a SQLEngine instance."""
-    db_path = request.app.state.db_path / "main.db"
-    llm = request.app.state.llm
-    model = request.app.state.model
-    return SQLEngine(db_path, llm, model)
-
-
-def _get_vector_engine(request: Request) -> VectorEngine:
-    """Get a VectorEngine instance."""
-    vector_client = request.app.state.vector_client
-    return VectorEngine(vector_client)
-
-
-def _get_orchestrator(request: Request) -> IntelligenceOrchestrator:
-    """Get an IntelligenceOrchestrator instance."""
-    db_path = request.app.state.db_path / "main.db"
-    knowledge_path = request.app.state.knowledge_path / "knowledge.json"
-    template_name = request.app.state.template
-    llm = request.app.state.llm
-    model = request.app.state.model
-    vector_client = request.app.state.vector_client
-
-    # Load template config
-    try:
-        template = load_template(template_name)
-        template_config = template.config
-    except Exception:
-        template_config = None
-
-    # Build component objects for the orchestrator
-    classifier = QuestionClassifier(llm, model)
-    sql_engine = SQLEngine(db_path, llm, model)
-    vector_engine = VectorEngine(vector_client)
-    knowledge = KnowledgeManager(knowledge_path, template_config)
-
-    return IntelligenceOrchestrator(
-        classifier=classifier,
-        sql_engine=sql_engine,
-        vector_engine=vector_engine,
-        knowledge=knowledge,
-        llm=llm,
-        model=model,
-    )
-
-
 def _audit_log_query_operation(
     request: Request,
     event_type: AuditEventType,
@@ -151,37 +134,28 @@ def _audit_log_query_operation(
     audit_logger.log(event)
 
 
-@router.post("/ask", response_model=IntelligenceResponse)
-def ask_question(
+def _answer_question(
     request: Request,
-    body: QuestionRequest,
+    question: str,
+    action: str = "ask_question",
 ) -> IntelligenceResponse:
-    """
-    Ask a natural language question about your data.
+    """Answer one question and audit-log the outcome.
 
-    The system automatically:
-    1. Classifies the question (SQL, semantic, strategic, or hybrid)
-    2. Gathers context from appropriate engines
-    3. Injects domain knowledge for strategic questions
-    4. Synthesizes a comprehensive answer
-
-    Handles all question types:
-    - Data queries: "How many vehicles over 60 days?"
-    - Similarity: "Find sales like this one"
-    - Strategic: "What's our ideal inventory?"
+    Errors are returned as an answer rather than raised, so one failing
+    question does not fail a whole batch.
     """
-    orchestrator = _get_orchestrator(request)
-
     try:
+        orchestrator = build_orchestrator(request)
+
         # Use simple rule-based classification for faster response
-        result = orchestrator.ask(body.question, use_simple_classification=True)
+        result = orchestrator.ask(question, use_simple_classification=True)
 
         # Log successful query
         _audit_log_query_operation(
             request=request,
             event_type=AuditEventType.QUERY_NATURAL,
-            query=body.question,
-            action="ask_question",
+            query=question,
+            action=action,
             details={
                 "classification": result.classification,
                 "sql_used": bool(result.sql_used),
@@ -205,8 +179,8 @@ def ask_question(
         _audit_log_query_operation(
             request=request,
             event_type=AuditEventType.QUERY_NATURAL,
-            query=body.question,
-            action="ask_question",
+            query=question,
+            action=action,
             details={},
             success=False,
             error=str(e),
@@ -219,22 +193,83 @@ def ask_question(
         )
 
 
+@router.post("/ask", response_model=IntelligenceResponse)
+def ask_question(
+    request: Request,
+    body: QuestionRequest,
+) -> IntelligenceResponse:
+    """
+    Ask a natural language question about your data.
+
+    The system automatically:
+    1. Classifies the question (SQL, semantic, strategic, or hybrid)
+    2. Gathers context from appropriate engines
+    3. Injects domain knowledge for strategic questions
+    4. Synthesizes a comprehensive answer
+
+    Handles all question types:
+    - Data queries: "How many vehicles over 60 days?"
+    - Similarity: "Find sales like this one"
+    - Strategic: "What's our ideal inventory?"
+    """
+    return _answer_question(request, body.question)
+
+
+@router.post("/ask/batch", response_model=BatchIntelligenceResponse)
+async def ask_questions(
+    request: Request,
+    body: BatchQuestionRequest,
+) -> BatchIntelligenceResponse:
+    """
+    Ask several natural language questions in one request.
+
+    Intended for dashboards and reports that issue many questions at once.
+    Identical questions are answered once, and distinct questions run
+    concurrently (at most ``BATCH_CONCURRENCY`` at a time), each with its
+    own orchestrator built in its worker thread. Results are returned in
+    the order the questions were asked.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def answer(question: str) -> IntelligenceResponse:
+        async with semaphore:
+            return await run_in_threadpool(
+                _answer_question, request, question, "ask_questions"
+            )
+
+    unique = list(dict.fromkeys(body.questions))
+    answers = dict(zip(unique, await asyncio.gather(*map(answer, unique))))
+
+    return BatchIntelligenceResponse(results=[answers[q] for q in body.questions])
+
+
 @router.post("/sql", response_model=SQLResponse)
 def execute_sql(
     request: Request,
     body: SQLRequest,
-) -> SQLResponse:
+) -> Response:
     """
     Execute raw SQL (for power users).
 
     Only SELECT statements are allowed for safety.
-    """
-    sql_engine = _get_sql_engine(request)
 
+    The result is serialized straight to JSON bytes: the rows come from
+    SQLite, so validating every cell against ``SQLResponse`` again would
+    only add per-row overhead on large result sets.
+    """
     try:
-        result = sql_engine.execute(body.sql, safe=True)
+        result = build_sql_engine(request).execute(body.sql, safe=True)
 
-        # Log successful SQL execution
+        # Rows may be sqlite3 tuples; they serialize as JSON arrays, so the
+        # list-type mismatch warnings are suppressed rather than emitted per row
+        content = SQLResponse.model_construct(
+            columns=result.columns,
+            rows=result.rows,
+            row_count=result.row_count,
+            sql=result.sql,
+        ).model_dump_json(warnings=False)
+
+        # Log successful SQL execution once the response is built
         _audit_log_query_operation(
             request=request,
             event_type=AuditEventType.QUERY_SQL,
@@ -244,12 +279,7 @@ def execute_sql(
             success=True,
         )
 
-        return SQLResponse(
-            columns=result.columns,
-            rows=result.rows,
-            row_count=result.row_count,
-            sql=result.sql,
-        )
+        return Response(content=content, media_type="application/json")
     except UnsafeQueryError as e:
         # Log unsafe query attempt
         _audit_log_query_operation(
@@ -293,10 +323,11 @@ class SimilarRecordResponse(BaseModel):
     similarity: float
 
 
-@router.post("/similar")
+@router.post("/similar", response_model=None)
 def find_similar(
     request: Request,
     body: SimilarityRequest,
+    vector_engine: VectorEngine = Depends(get_vector_engine),
 ) -> List[SimilarRecordResponse]:
     """
     Find records similar to a query or an existing record.
@@ -309,10 +340,8 @@ def find_similar(
     - "Find sales like this one" (by record_id)
     - "Find vehicles similar to: low mileage SUV under $30k" (by query)
     """
-    vector_engine = _get_vector_engine(request)
-
     # Check if collection exists
-    if body.table_name not in vector_engine.list_collections():
+    if not collection_exists(request, vector_engine, body.table_name):
         raise HTTPException(
             status_code=404,
             detail=f"No embeddings found for table '{body.table_name}'. "
@@ -354,8 +383,9 @@ def find_similar(
         success=True,
     )
 
+    # Results come from the vector engine, so skip re-validating each item
     return [
-        SimilarRecordResponse(
+        SimilarRecordResponse.model_construct(
             id=r.id,
             record=r.record,
             similarity=r.similarity,
@@ -369,7 +399,7 @@ class ScoreRequest(BaseModel):
 
     table_name: str
     category: str = "perfect_sale"
-    limit: Optional[int] = None
+    limit: Optional[int] = Field(default=None, ge=1, le=MAX_SCORE_LIMIT)
 
 
 class ScoredRecordResponse(BaseModel):
@@ -393,21 +423,7 @@ class ScoreResponse(BaseModel):
     total_records: int
 
 
-def _get_knowledge_manager(request: Request) -> KnowledgeManager:
-    """Get or create a KnowledgeManager instance."""
-    knowledge_path = request.app.state.knowledge_path / "knowledge.json"
-    template_name = request.app.state.template
-
-    try:
-        template = load_template(template_name)
-        template_config = template.config
-    except Exception:
-        template_config = None
-
-    return KnowledgeManager(knowledge_path, template_config)
-
-
-@router.post("/score", response_model=ScoreResponse)
+@router.post("/score", response_model=None)
 def score_records(
     request: Request,
     body: ScoreRequest,
@@ -422,8 +438,13 @@ def score_records(
     - Scored records sorted by quality (highest first)
     - Score distribution statistics
     - Factor performance analysis
+
+    Omitting ``limit`` returns every record in the table. With ``limit``
+    (at most MAX_SCORE_LIMIT), the highest-scoring records of the whole
+    table are returned, not the top of its first ``limit`` rows.
     """
-    db_path = request.app.state.db_path / "main.db"
+    require_valid_table_name(body.table_name)
+    db_path = request.app.state.main_db_path
 
     if not db_path.exists():
         raise HTTPException(
@@ -431,24 +452,24 @@ def score_records(
             detail="No database found. Upload data first.",
         )
 
-    km = _get_knowledge_manager(request)
+    km = get_knowledge_manager(request)
     scorer = SaleScorer(db_path, km, category=body.category)
 
     try:
-        # Score all records in the table
-        scored = scorer.score_table(
-            body.table_name,
-            limit=body.limit,
-            order_by_score=True,
-        )
+        # Score all records in the table; ``limit`` is applied here, after
+        # ordering, so it keeps the top records overall
+        scored = scorer.score_table(body.table_name, order_by_score=True)
+        if body.limit is not None:
+            scored = scored[: body.limit]
 
         # Get distribution and factor performance
         distribution = scorer.get_score_distribution(body.table_name)
         factor_performance = scorer.get_factor_performance(body.table_name)
 
-        return ScoreResponse(
+        # Scores come from the scorer, so skip re-validating each record
+        return ScoreResponse.model_construct(
             records=[
-                ScoredRecordResponse(
+                ScoredRecordResponse.model_construct(
                     record=s.record,
                     total_score=s.total_score,
                     max_possible=s.max_possible,
@@ -490,6 +511,7 @@ class PatternResponse(BaseModel):
 def find_patterns(
     request: Request,
     body: PatternRequest,
+    vector_engine: VectorEngine = Depends(get_vector_engine),
 ) -> PatternResponse:
     """
     Analyze what a set of records have in common.
@@ -500,9 +522,7 @@ def find_patterns(
 
     Provide IDs of "good" example records to analyze.
     """
-    vector_engine = _get_vector_engine(request)
-
-    if body.table_name not in vector_engine.list_collections():
+    if not collection_exists(request, vector_engine, body.table_name):
         raise HTTPException(
             status_code=404,
             detail=f"No embeddings found for table '{body.table_name}'. "
@@ -16,6 +16,7 @@ from intelligence.api import data, feedback, insights, knowledge, query
 from nebulus_core.intelligence.core.audit import AuditLogger
 from nebulus_core.llm.client import LLMClient
 from nebulus_core.vector.client import VectorClient
+from shared.audit.storage import enable_wal, ensure_indexes
 from shared.config.audit_config import AuditConfig
 from shared.middleware.audit_middleware import AuditMiddleware
 
@@ -50,6 +51,8 @@ async def lifespan(app: FastAPI):
     audit_config = AuditConfig.from_env()
     audit_db_path = AUDIT_PATH / "audit.db"
     audit_logger = AuditLogger(db_path=audit_db_path)
+    enable_wal(audit_db_path)
+    ensure_indexes(audit_db_path)
 
     print(f"  Audit logging: {'enabled' if audit_config.enabled else 'disabled'}")
     print(f"  Audit retention: {audit_config.retention_days} days")
@@ -60,6 +63,9 @@ async def lifespan(app: FastAPI):
     app.state.vector_path = VECTOR_PATH
     app.state.knowledge_path = KNOWLEDGE_PATH
     app.state.feedback_path = FEEDBACK_PATH
+    # Resolve per-file paths once instead of on every request
+    app.state.main_db_path = DB_PATH / "main.db"
+    app.state.knowledge_json_path = KNOWLEDGE_PATH / "knowledge.json"
     app.state.audit_logger = audit_logger
     app.state.audit_config = audit_config
 
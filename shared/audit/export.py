@@ -14,9 +14,12 @@ import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
-from nebulus_core.intelligence.core.audit import AuditLogger
+from nebulus_core.intelligence.core.audit import AuditEvent, AuditLogger
+
+# Number of audit events loaded per query during export
+EXPORT_PAGE_SIZE = 1000
 
 
 class AuditExporter:
@@ -76,67 +79,44 @@ class AuditExporter:
         elif start_date is None or end_date is None:
             raise ValueError("Must provide either 'days' or 'start_date'/'end_date'")
 
-        # Query audit events
-        events = self.audit_logger.get_events(
-            start_time=start_date,
-            end_time=end_date,
-            limit=999999,  # Export all matching records (large number)
-        )
-
-        # Write CSV
+        # Write CSV, streaming events one page at a time
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        fieldnames = [
+            "timestamp",
+            "event_type",
+            "user_id",
+            "session_id",
+            "ip_address",
+            "resource",
+            "action",
+            "details",
+            "success",
+            "error_message",
+        ]
+        record_count = 0
+
         with open(output_file, "w", newline="") as f:
-            if not events:
-                # Write empty CSV with headers
-                writer = csv.writer(f)
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+
+            for event in self._iter_events(start_date, end_date):
                 writer.writerow(
-                    [
-                        "timestamp",
-                        "event_type",
-                        "user_id",
-                        "session_id",
-                        "ip_address",
-                        "resource",
-                        "action",
-                        "details",
-                        "success",
-                        "error_message",
-                    ]
+                    {
+                        "timestamp": event.timestamp.isoformat(),
+                        "event_type": event.event_type.value,
+                        "user_id": event.user_id,
+                        "session_id": event.session_id or "",
+                        "ip_address": event.ip_address or "",
+                        "resource": event.resource or "",
+                        "action": event.action or "",
+                        "details": event.details or "",
+                        "success": event.success,
+                        "error_message": event.error_message or "",
+                    }
                 )
-            else:
-                # Write events
-                fieldnames = [
-                    "timestamp",
-                    "event_type",
-                    "user_id",
-                    "session_id",
-                    "ip_address",
-                    "resource",
-                    "action",
-                    "details",
-                    "success",
-                    "error_message",
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for event in events:
-                    writer.writerow(
-                        {
-                            "timestamp": event.timestamp.isoformat(),
-                            "event_type": event.event_type.value,
-                            "user_id": event.user_id,
-                            "session_id": event.session_id or "",
-                            "ip_address": event.ip_address or "",
-                            "resource": event.resource or "",
-                            "action": event.action or "",
-                            "details": event.details or "",
-                            "success": event.success,
-                            "error_message": event.error_message or "",
-                        }
-                    )
+                record_count += 1
 
         # Generate signature and metadata
         csv_hash = self._hash_file(output_file)
@@ -153,7 +133,7 @@ class AuditExporter:
             "export_timestamp": datetime.now().isoformat(),
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "record_count": len(events),
+            "record_count": record_count,
             "csv_hash": csv_hash,
             "signature_algorithm": "HMAC-SHA256",
         }
@@ -166,6 +146,38 @@ class AuditExporter:
             "metadata": str(meta_file),
         }
 
+    def _iter_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[AuditEvent]:
+        """Yield audit events in the date range, one page at a time.
+
+        Pages are fetched by keyset rather than OFFSET: each query narrows
+        ``end_time`` to the oldest timestamp already exported, so every page
+        costs the same and rows inserted or purged mid-export cannot shift
+        the window. ``end_time`` is inclusive, so events sharing that
+        timestamp are returned again; the ones already written are skipped.
+
+        Args:
+            start_date: Start of the export range
+            end_date: End of the export range
+
+        Yields:
+            Matching audit events, newest first
+        """
+        end_time = end_date
+        seen_at_end = 0
+        while True:
+            page = self.audit_logger.get_events(
+                start_time=start_date,
+                end_time=end_time,
+                limit=seen_at_end + EXPORT_PAGE_SIZE,
+            )
+            yield from page[seen_at_end:]
+            if len(page) < seen_at_end + EXPORT_PAGE_SIZE:
+                return
+            end_time = page[-1].timestamp
+            seen_at_end = sum(1 for event in page if event.timestamp == end_time)
+
     def verify_export(self, csv_path: str) -> Dict[str, bool]:
         """Verify integrity and authenticity of exported CSV.
 
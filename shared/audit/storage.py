@@ -0,0 +1,55 @@
+"""SQLite storage tuning for audit databases.
+
+AuditLogger (from nebulus-core) opens a new connection per call, so only
+settings that persist in the database file can be applied from here.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+# Composite indexes for the common audit queries: latest events per user and
+# event counts per type over a time window.
+AUDIT_INDEXES = {
+    "idx_audit_user_ts": "audit_log(user_id, timestamp DESC)",
+    "idx_audit_type_ts": "audit_log(event_type, timestamp)",
+}
+
+
+def enable_wal(db_path: Union[str, Path]) -> str:
+    """Switch an audit database to write-ahead logging.
+
+    WAL mode is stored in the database file, so every later connection
+    (including those opened by AuditLogger) appends to the log instead of
+    rewriting a rollback journal, and readers no longer block writers.
+
+    Args:
+        db_path: Path to the audit database
+
+    Returns:
+        The journal mode in effect after the call
+    """
+    if str(db_path) == ":memory:":
+        return "memory"
+
+    conn = sqlite3.connect(db_path, timeout=5.0)
+    try:
+        row = conn.execute("PRAGMA journal_mode=WAL").fetchone()
+    finally:
+        conn.close()
+    return row[0]
+
+
+def ensure_indexes(db_path: Union[str, Path]) -> None:
+    """Create the composite audit_log indexes if they are missing.
+
+    Args:
+        db_path: Path to an audit database whose audit_log table exists
+    """
+    conn = sqlite3.connect(db_path, timeout=5.0)
+    try:
+        for name, target in AUDIT_INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,71 @@
+"""Tests for data API table-name validation."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from intelligence.api import data
+
+
+class RecordingAuditLogger:
+    """Stand-in AuditLogger that keeps logged events."""
+
+    def __init__(self):
+        self.events = []
+
+    def log(self, event):
+        self.events.append(event)
+
+
+class FakeUpload:
+    """Stand-in UploadFile with a fixed filename and body."""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    async def read(self):
+        return b"id,value\n1,2\n"
+
+
+@pytest.fixture
+def audited_request():
+    """Create a request object with audit logging enabled."""
+    state = SimpleNamespace(
+        audit_logger=RecordingAuditLogger(),
+        audit_config=SimpleNamespace(enabled=True),
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state), state=SimpleNamespace())
+
+
+@pytest.fixture(autouse=True)
+def no_ingestor(monkeypatch):
+    """Fail loudly if a rejected name reaches the ingestor."""
+
+    def fail(request):
+        raise AssertionError("ingestor should not be created")
+
+    monkeypatch.setattr(data, "_get_ingestor", fail)
+
+
+@pytest.mark.parametrize(
+    "filename, table_name",
+    [("2024 Sales.csv", None), ("sales.csv", "sales; DROP TABLE users")],
+)
+def test_upload_rejects_invalid_table_name(audited_request, filename, table_name):
+    """Test that uploads cannot create tables the other routes reject."""
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(data.upload_csv(audited_request, FakeUpload(filename), table_name))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_delete_invalid_table_name_is_audited(audited_request):
+    """Test that a rejected delete still leaves a failed audit event."""
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(data.delete_table(audited_request, "sales; DROP TABLE users"))
+
+    assert exc_info.value.status_code == 400
+    events = audited_request.app.state.audit_logger.events
+    assert [(e.action, e.success) for e in events] == [("delete_table", False)]
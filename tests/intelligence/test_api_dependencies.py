@@ -0,0 +1,258 @@
+"""Tests for the shared intelligence API dependency helpers."""
+
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from intelligence.api import dependencies
+
+
+class FakeKnowledgeManager:
+    """Stand-in for KnowledgeManager that records construction."""
+
+    instances = 0
+
+    def __init__(self, knowledge_path, template_config):
+        FakeKnowledgeManager.instances += 1
+        self.knowledge_path = knowledge_path
+        self.template_config = template_config
+
+
+@pytest.fixture
+def knowledge_dir():
+    """Create a temporary knowledge directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def fake_request(knowledge_dir):
+    """Create a minimal request object exposing app.state."""
+    state = SimpleNamespace(
+        knowledge_json_path=knowledge_dir / "knowledge.json",
+        template="dealership",
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+@pytest.fixture(autouse=True)
+def fake_knowledge(monkeypatch):
+    """Swap in the fake manager and clear caches around each test."""
+    monkeypatch.setattr(dependencies, "KnowledgeManager", FakeKnowledgeManager)
+    monkeypatch.setattr(dependencies, "load_template", lambda name: None)
+    FakeKnowledgeManager.instances = 0
+    dependencies._load_template_once.cache_clear()
+    dependencies._build_knowledge_manager.cache_clear()
+    yield
+    dependencies._load_template_once.cache_clear()
+    dependencies._build_knowledge_manager.cache_clear()
+
+
+def test_load_template_config_returns_none_on_error():
+    """Test that a template that fails to load yields None."""
+    assert dependencies.load_template_config("missing") is None
+
+
+def test_template_loaded_once(monkeypatch):
+    """Test that the template is parsed once and shared with its config."""
+    loads = []
+
+    def fake_load_template(name):
+        loads.append(name)
+        return SimpleNamespace(config={"name": name})
+
+    monkeypatch.setattr(dependencies, "load_template", fake_load_template)
+
+    template = dependencies.load_cached_template("dealership")
+
+    assert dependencies.load_cached_template("dealership") is template
+    assert dependencies.load_template_config("dealership") is template.config
+    assert loads == ["dealership"]
+
+
+def test_template_load_failure_retried(monkeypatch):
+    """Test that a failed template load is not cached."""
+    attempts = []
+
+    def flaky_load_template(name):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise OSError("transient read error")
+        return SimpleNamespace(config={"name": name})
+
+    monkeypatch.setattr(dependencies, "load_template", flaky_load_template)
+
+    assert dependencies.load_cached_template("dealership") is None
+    assert dependencies.load_cached_template("dealership") is not None
+    assert len(attempts) == 2
+
+
+def test_knowledge_manager_cached_across_requests(fake_request):
+    """Test that repeated requests reuse the same KnowledgeManager."""
+    first = dependencies.get_knowledge_manager(fake_request)
+    second = dependencies.get_knowledge_manager(fake_request)
+
+    assert first is second
+    assert FakeKnowledgeManager.instances == 1
+
+
+def test_knowledge_manager_rebuilt_when_file_changes(fake_request, knowledge_dir):
+    """Test that a modified knowledge file invalidates the cached manager."""
+    first = dependencies.get_knowledge_manager(fake_request)
+
+    (knowledge_dir / "knowledge.json").write_text("{}")
+    second = dependencies.get_knowledge_manager(fake_request)
+
+    assert first is not second
+    assert FakeKnowledgeManager.instances == 2
+
+
+class FakeEngine:
+    """Stand-in for the query engines and orchestrator."""
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
+@pytest.fixture
+def engine_request(fake_request, monkeypatch):
+    """Extend the fake request with the state the engines need."""
+    for name in (
+        "SQLEngine",
+        "VectorEngine",
+        "QuestionClassifier",
+        "IntelligenceOrchestrator",
+    ):
+        monkeypatch.setattr(dependencies, name, FakeEngine)
+
+    state = fake_request.app.state
+    state.main_db_path = Path("main.db")
+    state.llm = object()
+    state.model = "test-model"
+    state.vector_client = object()
+    return fake_request
+
+
+def test_feedback_manager_created_once(fake_request, monkeypatch):
+    """Test that the FeedbackManager is shared across requests."""
+    monkeypatch.setattr(dependencies, "FeedbackManager", FakeEngine)
+    fake_request.app.state.feedback_path = Path("feedback")
+
+    first = dependencies.get_feedback_manager(fake_request)
+    second = dependencies.get_feedback_manager(fake_request)
+
+    assert first is second
+    assert first.args == (Path("feedback") / "feedback.db",)
+
+
+def test_pii_detector_created_once(fake_request, monkeypatch):
+    """Test that the PIIDetector is shared across uploads."""
+    monkeypatch.setattr(dependencies, "PIIDetector", FakeEngine)
+
+    first = dependencies.get_pii_detector(fake_request)
+    second = dependencies.get_pii_detector(fake_request)
+
+    assert first is second
+
+
+def test_sql_engine_built_per_request(engine_request):
+    """Test that each request gets its own SQLEngine."""
+    first = dependencies.build_sql_engine(engine_request)
+    second = dependencies.build_sql_engine(engine_request)
+
+    assert first is not second
+    assert first.args == (Path("main.db"), engine_request.app.state.llm, "test-model")
+
+
+def test_vector_engine_created_once(engine_request):
+    """Test that the VectorEngine is shared across requests."""
+    first = asyncio.run(dependencies.get_vector_engine(engine_request))
+    second = asyncio.run(dependencies.get_vector_engine(engine_request))
+
+    assert first is second
+
+
+def test_orchestrator_shares_only_stateless_parts(engine_request):
+    """Test that orchestrators get fresh SQL engines but shared knowledge."""
+    first = dependencies.build_orchestrator(engine_request)
+    second = dependencies.build_orchestrator(engine_request)
+
+    assert first is not second
+    assert first.kwargs["sql_engine"] is not second.kwargs["sql_engine"]
+    assert first.kwargs["vector_engine"] is second.kwargs["vector_engine"]
+    assert first.kwargs["knowledge"] is second.kwargs["knowledge"]
+
+
+class FakeVectorEngine:
+    """Stand-in VectorEngine that counts collection listings."""
+
+    def __init__(self, collections):
+        self.collections = collections
+        self.list_calls = 0
+
+    def list_collections(self):
+        self.list_calls += 1
+        return list(self.collections)
+
+
+def test_collection_exists_uses_cached_names(fake_request):
+    """Test that known collections are served without listing again."""
+    vector_engine = FakeVectorEngine(["sales"])
+
+    assert dependencies.collection_exists(fake_request, vector_engine, "sales")
+    assert dependencies.collection_exists(fake_request, vector_engine, "sales")
+    assert vector_engine.list_calls == 1
+
+
+def test_collection_exists_refreshes_on_miss(fake_request):
+    """Test that a miss re-lists collections to pick up new tables."""
+    vector_engine = FakeVectorEngine(["sales"])
+    dependencies.collection_exists(fake_request, vector_engine, "sales")
+
+    vector_engine.collections.append("inventory")
+
+    assert dependencies.collection_exists(fake_request, vector_engine, "inventory")
+    assert not dependencies.collection_exists(fake_request, vector_engine, "missing")
+    assert vector_engine.list_calls == 3
+
+
+def test_collection_exists_rechecks_after_ttl(fake_request, monkeypatch):
+    """Test that a collection deleted elsewhere is noticed after the TTL."""
+    vector_engine = FakeVectorEngine(["sales"])
+    dependencies.collection_exists(fake_request, vector_engine, "sales")
+
+    vector_engine.collections.remove("sales")
+    monkeypatch.setattr(dependencies, "KNOWN_COLLECTIONS_TTL", 0.0)
+
+    assert not dependencies.collection_exists(fake_request, vector_engine, "sales")
+    assert vector_engine.list_calls == 2
+
+
+def test_invalidate_known_collections(fake_request):
+    """Test that invalidation forces the next check to re-list."""
+    vector_engine = FakeVectorEngine(["sales"])
+    dependencies.collection_exists(fake_request, vector_engine, "sales")
+
+    vector_engine.collections.remove("sales")
+    dependencies.invalidate_known_collections(fake_request)
+
+    assert not dependencies.collection_exists(fake_request, vector_engine, "sales")
+    assert vector_engine.list_calls == 2
+
+
+def test_require_valid_table_name_accepts_identifier():
+    """Test that a plain identifier is returned unchanged."""
+    assert dependencies.require_valid_table_name("sales_2024") == "sales_2024"
+
+
+def test_require_valid_table_name_rejects_injection():
+    """Test that unsafe names are rejected with a 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        dependencies.require_valid_table_name("sales; DROP TABLE users")
+
+    assert exc_info.value.status_code == 400
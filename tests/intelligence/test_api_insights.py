@@ -0,0 +1,171 @@
+"""Tests for the insights API report cache."""
+
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from intelligence.api import insights
+from nebulus_core.intelligence.core.insights import InsightPriority
+
+
+def _insight(priority, category):
+    """Build a stand-in Insight with the fields the routes read."""
+    return SimpleNamespace(
+        insight_type=SimpleNamespace(value="risk"),
+        priority=priority,
+        title="title",
+        description="description",
+        data_points={},
+        recommendations=[],
+        generated_at=datetime.now(timezone.utc),
+        table_name="inventory",
+        category=category,
+    )
+
+
+class FakeGenerator:
+    """Stand-in InsightGenerator that counts report generation."""
+
+    calls = 0
+    delay = 0.0
+    slow_tables = None
+    error = None
+    started = threading.Event()
+
+    def __init__(self, db_path, knowledge):
+        self.db_path = db_path
+
+    def generate_insights(self, tables=None):
+        FakeGenerator.calls += 1
+        FakeGenerator.started.set()
+        if FakeGenerator.error is not None:
+            raise FakeGenerator.error
+        if FakeGenerator.slow_tables is None or tables == FakeGenerator.slow_tables:
+            time.sleep(FakeGenerator.delay)
+        return SimpleNamespace(
+            tables=tables,
+            insights=[
+                _insight(InsightPriority.HIGH, "pricing"),
+                _insight(InsightPriority.LOW, "pricing"),
+                _insight(InsightPriority.CRITICAL, "inventory_health"),
+            ],
+        )
+
+
+@pytest.fixture(autouse=True)
+def fake_generator(monkeypatch):
+    """Swap in the fake generator and skip knowledge loading."""
+    monkeypatch.setattr(insights, "InsightGenerator", FakeGenerator)
+    monkeypatch.setattr(insights, "_get_knowledge", lambda request: None)
+    FakeGenerator.calls = 0
+    FakeGenerator.delay = 0.0
+    FakeGenerator.slow_tables = None
+    FakeGenerator.error = None
+    FakeGenerator.started = threading.Event()
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary database file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "main.db"
+        path.write_bytes(b"data")
+        yield path
+
+
+@pytest.fixture
+def fake_request(db_path):
+    """Create a minimal request object exposing app.state."""
+    state = SimpleNamespace(main_db_path=db_path, template="dealership")
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+def test_report_reused_while_database_unchanged(fake_request):
+    """Test that repeated requests share one generated report."""
+    first = insights._get_report(fake_request, "sales, inventory")
+    second = insights._get_report(fake_request, "sales,inventory")
+
+    assert first is second
+    assert first.tables == ["sales", "inventory"]
+    assert FakeGenerator.calls == 1
+
+
+def test_report_regenerated_when_database_changes(fake_request, db_path):
+    """Test that a modified database file invalidates the cached report."""
+    first = insights._get_report(fake_request)
+    db_path.write_bytes(b"more data")
+
+    assert insights._get_report(fake_request) is not first
+    assert FakeGenerator.calls == 2
+
+
+def test_report_regenerated_after_ttl(fake_request, monkeypatch):
+    """Test that cached reports expire after REPORT_CACHE_TTL."""
+    insights._get_report(fake_request)
+    monkeypatch.setattr(insights, "REPORT_CACHE_TTL", 0.0)
+    insights._get_report(fake_request)
+
+    assert FakeGenerator.calls == 2
+
+
+def test_filtered_routes_share_cached_report(fake_request):
+    """Test that priority and category views filter one cached report."""
+    high = insights.get_high_priority_insights(fake_request)
+    pricing = insights.get_insights_by_category(fake_request, "pricing")
+
+    assert [i.priority for i in high] == ["high", "critical"]
+    assert [i.category for i in pricing] == ["pricing", "pricing"]
+    assert FakeGenerator.calls == 1
+
+
+def test_concurrent_cold_requests_generate_once(fake_request):
+    """Test that concurrent requests on a cold cache share one analysis."""
+    FakeGenerator.delay = 0.05
+    reports = []
+
+    def fetch():
+        reports.append(insights._get_report(fake_request))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeGenerator.calls == 1
+    assert all(report is reports[0] for report in reports)
+
+
+def test_slow_report_does_not_block_other_tables(fake_request):
+    """Test that generating one report does not hold up a different one."""
+    FakeGenerator.delay = 1.0
+    FakeGenerator.slow_tables = ["sales"]
+
+    slow = threading.Thread(target=insights._get_report, args=(fake_request, "sales"))
+    slow.start()
+    assert FakeGenerator.started.wait(1.0)
+
+    started = time.monotonic()
+    insights._get_report(fake_request, "inventory")
+    elapsed = time.monotonic() - started
+    slow.join()
+
+    assert elapsed < 0.5
+    assert FakeGenerator.calls == 2
+
+
+def test_failed_generation_is_not_cached(fake_request):
+    """Test that a failed analysis is retried on the next request."""
+    FakeGenerator.error = RuntimeError("analysis failed")
+    with pytest.raises(RuntimeError):
+        insights._get_report(fake_request)
+
+    FakeGenerator.error = None
+
+    assert insights._get_report(fake_request).insights
+    assert FakeGenerator.calls == 2
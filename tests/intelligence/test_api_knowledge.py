@@ -0,0 +1,58 @@
+"""Tests for the knowledge API export cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from intelligence.api import knowledge
+
+
+class FakeKnowledgeManager:
+    """Stand-in KnowledgeManager that counts prompt exports."""
+
+    def __init__(self):
+        self.prompt_calls = 0
+
+    def export_for_prompt(self):
+        self.prompt_calls += 1
+        return f"prompt-{self.prompt_calls}"
+
+
+@pytest.fixture
+def current_km(monkeypatch):
+    """Serve a swappable KnowledgeManager from the router's provider."""
+    holder = SimpleNamespace(km=FakeKnowledgeManager())
+    monkeypatch.setattr(knowledge, "get_knowledge_manager", lambda request: holder.km)
+    return holder
+
+
+@pytest.fixture
+def fake_request():
+    """Create a minimal request object exposing app.state."""
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+
+def test_prompt_export_cached(fake_request, current_km):
+    """Test that the prompt is built once per KnowledgeManager."""
+    first = knowledge.get_knowledge_prompt(fake_request)
+    second = knowledge.get_knowledge_prompt(fake_request)
+
+    assert first == second == {"prompt": "prompt-1"}
+    assert current_km.km.prompt_calls == 1
+
+
+def test_prompt_export_rebuilt_for_new_manager(fake_request, current_km):
+    """Test that a replaced KnowledgeManager invalidates the cache."""
+    knowledge.get_knowledge_prompt(fake_request)
+    current_km.km = FakeKnowledgeManager()
+
+    assert knowledge.get_knowledge_prompt(fake_request) == {"prompt": "prompt-1"}
+    assert current_km.km.prompt_calls == 1
+
+
+def test_prompt_export_invalidated_after_modification(fake_request, current_km):
+    """Test that in-place modifications drop the cached prompt."""
+    knowledge.get_knowledge_prompt(fake_request)
+    knowledge._invalidate_exports(fake_request)
+
+    assert knowledge.get_knowledge_prompt(fake_request) == {"prompt": "prompt-2"}
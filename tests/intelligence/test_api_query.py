@@ -0,0 +1,210 @@
+"""Tests for the query API endpoints."""
+
+import asyncio
+import json
+import threading
+import warnings
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from intelligence.api import query
+
+
+class FakeOrchestrator:
+    """Stand-in orchestrator that records the questions it answers."""
+
+    def __init__(self):
+        self.questions = []
+        self._lock = threading.Lock()
+
+    def ask(self, question, use_simple_classification=False):
+        if question == "boom":
+            raise RuntimeError("engine failure")
+        with self._lock:
+            self.questions.append(question)
+        return SimpleNamespace(
+            answer=f"answer to {question}",
+            supporting_data=None,
+            reasoning=None,
+            sql_used=None,
+            similar_records=None,
+            classification="sql",
+            confidence=0.9,
+        )
+
+
+@pytest.fixture
+def fake_request():
+    """Create a minimal request object without an audit logger."""
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+
+def _ask(fake_request, orchestrator, questions, monkeypatch):
+    monkeypatch.setattr(query, "build_orchestrator", lambda request: orchestrator)
+    body = query.BatchQuestionRequest(questions=questions)
+    return asyncio.run(query.ask_questions(fake_request, body))
+
+
+def test_batch_answers_in_request_order(fake_request, monkeypatch):
+    """Test that answers line up with the questions asked."""
+    orchestrator = FakeOrchestrator()
+
+    response = _ask(fake_request, orchestrator, ["a", "b", "c"], monkeypatch)
+
+    assert [r.answer for r in response.results] == [
+        "answer to a",
+        "answer to b",
+        "answer to c",
+    ]
+    assert sorted(orchestrator.questions) == ["a", "b", "c"]
+
+
+def test_batch_answers_duplicate_questions_once(fake_request, monkeypatch):
+    """Test that identical questions share one orchestrator call."""
+    orchestrator = FakeOrchestrator()
+
+    response = _ask(fake_request, orchestrator, ["a", "b", "a"], monkeypatch)
+
+    assert orchestrator.questions.count("a") == 1
+    assert response.results[0] == response.results[2]
+
+
+def test_batch_isolates_failing_question(fake_request, monkeypatch):
+    """Test that one failing question does not fail the batch."""
+    response = _ask(fake_request, FakeOrchestrator(), ["boom", "a"], monkeypatch)
+
+    assert "engine failure" in response.results[0].answer
+    assert response.results[0].confidence == 0.0
+    assert response.results[1].answer == "answer to a"
+
+
+def test_batch_rejects_too_many_questions():
+    """Test that batches are capped at MAX_BATCH_QUESTIONS."""
+    with pytest.raises(ValidationError):
+        query.BatchQuestionRequest(questions=["q"] * (query.MAX_BATCH_QUESTIONS + 1))
+
+
+class FakeSQLEngine:
+    """Stand-in SQLEngine returning sqlite-style tuple rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql, safe=True):
+        return SimpleNamespace(
+            columns=["id", "name"],
+            rows=self.rows,
+            row_count=len(self.rows),
+            sql=sql,
+        )
+
+
+class RecordingAuditLogger:
+    """Stand-in AuditLogger that keeps logged events."""
+
+    def __init__(self):
+        self.events = []
+
+    def log(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def audited_request():
+    """Create a request object with audit logging enabled."""
+    state = SimpleNamespace(
+        audit_logger=RecordingAuditLogger(),
+        audit_config=SimpleNamespace(enabled=True),
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state), state=SimpleNamespace())
+
+
+def test_sql_serializes_tuple_rows_without_warnings(audited_request, monkeypatch):
+    """Test that tuple rows serialize as JSON arrays without warnings."""
+    engine = FakeSQLEngine([(1, "a"), (2, None)])
+    monkeypatch.setattr(query, "build_sql_engine", lambda request: engine)
+    body = query.SQLRequest(sql="SELECT id, name FROM sales")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response = query.execute_sql(audited_request, body)
+
+    assert json.loads(response.body)["rows"] == [[1, "a"], [2, None]]
+    assert [e.success for e in audited_request.app.state.audit_logger.events] == [True]
+
+
+def test_sql_serialization_failure_logged_once(audited_request, monkeypatch):
+    """Test that a response that cannot be serialized logs only a failure."""
+    engine = FakeSQLEngine([(1, object())])
+    monkeypatch.setattr(query, "build_sql_engine", lambda request: engine)
+    body = query.SQLRequest(sql="SELECT id, name FROM sales")
+
+    with pytest.raises(HTTPException):
+        query.execute_sql(audited_request, body)
+
+    events = audited_request.app.state.audit_logger.events
+    assert [e.success for e in events] == [False]
+
+
+class FakeScorer:
+    """Stand-in SaleScorer that records score_table arguments."""
+
+    calls = []
+
+    def __init__(self, db_path, knowledge, category):
+        self.category = category
+
+    def score_table(self, table_name, limit=None, order_by_score=True):
+        FakeScorer.calls.append({"limit": limit, "order_by_score": order_by_score})
+        return [
+            SimpleNamespace(
+                record={"id": i},
+                total_score=score,
+                max_possible=10.0,
+                percentage=score * 10,
+                factor_scores={},
+                factor_details={},
+            )
+            for i, score in enumerate([9.0, 7.0, 4.0])
+        ]
+
+    def get_score_distribution(self, table_name):
+        return {"count": 3}
+
+    def get_factor_performance(self, table_name):
+        return {}
+
+
+@pytest.fixture
+def score_request(tmp_path, monkeypatch):
+    """Create a request with a database file and a fake scorer."""
+    db_path = tmp_path / "main.db"
+    db_path.write_bytes(b"")
+    FakeScorer.calls = []
+    monkeypatch.setattr(query, "SaleScorer", FakeScorer)
+    monkeypatch.setattr(query, "get_knowledge_manager", lambda request: None)
+    state = SimpleNamespace(main_db_path=db_path)
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+def test_score_without_limit_returns_every_record(score_request):
+    """Test that omitting limit scores the whole table."""
+    body = query.ScoreRequest(table_name="sales")
+
+    response = query.score_records(score_request, body)
+
+    assert response.total_records == 3
+    assert FakeScorer.calls == [{"limit": None, "order_by_score": True}]
+
+
+def test_score_limit_keeps_top_records_overall(score_request):
+    """Test that limit is applied after ordering the whole table."""
+    body = query.ScoreRequest(table_name="sales", limit=2)
+
+    response = query.score_records(score_request, body)
+
+    assert [r.total_score for r in response.records] == [9.0, 7.0]
+    assert FakeScorer.calls == [{"limit": None, "order_by_score": True}]
@@ -1,5 +1,6 @@
 """Tests for audit export functionality."""
 
+import csv
 import json
 import tempfile
 from datetime import datetime, timedelta
@@ -158,3 +159,55 @@ def test_export_empty_database():
 
     # Cleanup
     Path(db_path).unlink(missing_ok=True)
+
+
+def test_export_csv_pages_through_events(exporter, monkeypatch):
+    """Test that exports spanning several pages include every event once."""
+    monkeypatch.setattr("shared.audit.export.EXPORT_PAGE_SIZE", 3)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "audit_export.csv"
+
+        files = exporter.export_csv(output_path=str(output_path), days=30)
+
+        lines = Path(files["csv"]).read_text().splitlines()
+        assert len(lines) == 11  # header + 10 events
+
+        with open(files["metadata"]) as f:
+            metadata = json.load(f)
+        assert metadata["record_count"] == 10
+
+
+def test_export_csv_pages_across_tied_timestamps(monkeypatch):
+    """Test that events sharing a timestamp on a page boundary export once."""
+    monkeypatch.setattr("shared.audit.export.EXPORT_PAGE_SIZE", 3)
+
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    logger = AuditLogger(db_path=db_path)
+    base = datetime.now() - timedelta(hours=1)
+    # Groups of 2, 4 and 3 events share a timestamp, straddling pages of 3
+    for i, minutes in enumerate([0, 0, 1, 1, 1, 1, 2, 2, 2]):
+        logger.log(
+            AuditEvent(
+                event_type=AuditEventType.DATA_UPLOAD,
+                timestamp=base + timedelta(minutes=minutes),
+                user_id=f"tied_{i}",
+                action="upload",
+                success=True,
+            )
+        )
+
+    exporter = AuditExporter(db_path=db_path, secret_key="test-secret-key")
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir) / "audit_export.csv"
+            files = exporter.export_csv(output_path=str(output_path), days=1)
+
+            with open(files["csv"]) as f:
+                user_ids = [row["user_id"] for row in csv.DictReader(f)]
+
+        assert sorted(user_ids) == sorted(f"tied_{i}" for i in range(9))
+    finally:
+        db_path.unlink(missing_ok=True)
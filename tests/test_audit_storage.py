@@ -0,0 +1,78 @@
+"""Tests for audit database storage tuning."""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from shared.audit.storage import enable_wal, ensure_indexes
+
+
+@pytest.fixture
+def db_path():
+    """Create a temporary SQLite database with one table."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "audit.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE audit_log ("
+            "id INTEGER PRIMARY KEY, timestamp TEXT, event_type TEXT, user_id TEXT)"
+        )
+        conn.commit()
+        conn.close()
+        yield path
+
+
+def test_enable_wal_sets_journal_mode(db_path):
+    """Test that the database is switched to WAL mode."""
+    assert enable_wal(db_path) == "wal"
+
+
+def test_enable_wal_persists_for_new_connections(db_path):
+    """Test that later connections see WAL mode without re-applying it."""
+    enable_wal(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+    assert mode == "wal"
+
+
+def test_enable_wal_is_idempotent(db_path):
+    """Test that enabling WAL twice is harmless."""
+    enable_wal(db_path)
+    assert enable_wal(db_path) == "wal"
+
+
+def test_enable_wal_skips_memory_database():
+    """Test that in-memory databases are left alone."""
+    assert enable_wal(":memory:") == "memory"
+
+
+def test_ensure_indexes_creates_composite_indexes(db_path):
+    """Test that the composite indexes are created and reused."""
+    ensure_indexes(db_path)
+    ensure_indexes(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        names = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM audit_log "
+            "WHERE user_id = ? ORDER BY timestamp DESC LIMIT 10",
+            ("user_1",),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert {"idx_audit_user_ts", "idx_audit_type_ts"} <= names
+    assert any("idx_audit_user_ts" in row[-1] for row in plan)